@@ -3,42 +3,204 @@ import time
 import serial
 import math
 import os
+import re
 import argparse
+import weakref
 from datetime import datetime
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QListWidget, QGroupBox, QSizePolicy, QPushButton,
     QSlider, QSpinBox, QGridLayout
 )
-from PyQt5.QtCore import QTimer, Qt, QPointF
-from PyQt5.QtGui import QPainter, QColor, QFont, QPen, QFontMetrics
+from PyQt5.QtCore import QTimer, Qt, QPointF, QRect, QEvent, QSocketNotifier
+from PyQt5.QtGui import QPainter, QColor, QFont, QPen, QFontMetrics, QPixmap, QPainterPath
 
-class CompactAnalogGauge(QWidget):
-    def __init__(self, title, min_val, max_val, units, parent=None):
-        super().__init__(parent)
+# Everything except numbers, commas, decimal points and separators
+_CSV_JUNK = re.compile(r'[^0-9,.\- ]')
+
+# Control and C1 characters mark a line as noise, tab and printable text don't
+_LINE_NOISE = re.compile(r'[\x00-\x08\x0b-\x1f\x7f-\x9f]')
+
+# Last update label styles
+TIME_FRESH_STYLE = "color: #00C8FF; font-weight: bold;"
+TIME_STALE_STYLE = "color: #FF5050; font-weight: bold;"
+
+# Needle direction table over the 180 degree sweep, indexed by value ratio
+NEEDLE_STEPS = 1023
+NEEDLE_COS = tuple(math.cos(math.pi + i / NEEDLE_STEPS * math.pi) for i in range(NEEDLE_STEPS + 1))
+NEEDLE_SIN = tuple(math.sin(math.pi + i / NEEDLE_STEPS * math.pi) for i in range(NEEDLE_STEPS + 1))
+
+# Tick directions, identical for every gauge
+TICK_TRIG = tuple(
+    (math.cos(math.radians(180 + i * 30)), math.sin(math.radians(180 + i * 30)))
+    for i in range(0, 7)
+)
+
+def parse_telemetry(data):
+    """Parse a CSV telemetry line into
+    (time_ms, thrust, current, voltage, rpm, power, eff), None if it is not one"""
+    # Extract numbers, commas, and decimal points
+    parts = _CSV_JUNK.sub('', data).split(',')
+    # Require at least 5 values
+    if len(parts) < 5:
+        return None
+
+    try:
+        # Parse all values
+        time_ms = int(parts[0])
+        thrust = float(parts[1])
+        current = float(parts[2].strip().partition(' ')[0])
+        voltage = float(parts[3].strip().partition(' ')[0])
+        rpm = float(parts[4].strip().partition(' ')[0])
+    except ValueError:
+        # Don't log non-CSV errors since we're already ignoring them
+        return None
+
+    # Calculate power
+    power = 0
+    if (current >= 0.001):
+        power = voltage * current
+
+    # Calculate eff
+    eff = 0
+    if (power >= 0.001):
+        eff = thrust/power;
+
+    return time_ms, thrust, current, voltage, rpm, power, eff
+
+class CompactAnalogGauge:
+    """Single dial drawn by a GaugePanel inside its assigned rect"""
+    # Dial faces shared between gauges with the same size and labels,
+    # dropped once no gauge references them anymore
+    _bg_cache = weakref.WeakValueDictionary()
+
+    def __init__(self, title, min_val, max_val, units, panel):
         self.title = title
         self.min_val = min_val
         self.max_val = max_val
         self.units = units
         self.value = min_val
-        self.setMinimumSize(150, 150)
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.panel = panel
+        self.rect = QRect()
+        self._bg_pixmap = None
+        self._bg_dpr = None
+
+        # Format values appropriately, decided once for the range
+        if self.max_val > 30000:
+            self._value_fmt = "{:.0f} {}"
+            tick_div, tick_fmt = 1000, "{:.0f}k"
+        elif self.max_val >= 1000:
+            self._value_fmt = "{:.1f} {}"
+            tick_div, tick_fmt = 1000, "{:.1f}k"
+        else:
+            self._value_fmt = "{:.1f} {}"
+            tick_div, tick_fmt = 1, "{:.0f}"
+
+        self._tick_labels = {}
+        for i in (0, 2, 4, 6):
+            value = self.min_val + (i / 6) * (self.max_val - self.min_val)
+            self._tick_labels[i] = tick_fmt.format(value / tick_div)
+        self._tick_label_sizes = None
+
+        # Fonts and metrics for title and digital value, title never changes
+        self._title_font = QFont("Arial", 9, QFont.Bold)
+        self._title_fm = QFontMetrics(self._title_font)
+        self._title_width = self._title_fm.horizontalAdvance(self.title)
+        self._value_font = QFont("Arial", 10, QFont.Bold)
+        self._value_fm = QFontMetrics(self._value_font)
+
+        # Digital value box sits below the dial center
+        self._value_box_height = self._value_fm.height() * 1.3
+        self._last_needle_rect = None
         
-    def set_value(self, value):
+    def set_value(self, value, update=True):
         self.value = max(self.min_val, min(value, self.max_val))
-        self.update()
-        
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        if update:
+            self.update_dial()
+
+    def update_dial(self):
+        # Only the painted and new needle positions plus the value box need repainting
+        if self._last_needle_rect is None:
+            dirty_rect = self._dial_rect()
+        else:
+            dirty_rect = self._needle_rect().united(self._value_rect())
+            dirty_rect = dirty_rect.united(self._last_needle_rect)
+        self.panel.update(dirty_rect.translated(self.rect.topLeft()))
         
-        # Compact dimensions
-        width = self.width()
-        height = self.height()
+    def set_geometry(self, rect):
+        # Static dial face depends on gauge size only
+        if rect.size() != self.rect.size():
+            self._bg_pixmap = None
+        self.rect = QRect(rect)
+        self._last_needle_rect = None
+
+    def font_changed(self):
+        # Tick label metrics depend on the panel font
+        self._tick_label_sizes = None
+        self._bg_pixmap = None
+
+    def _geometry(self):
+        # Compact dimensions, relative to the gauge rect
+        width = self.rect.width()
+        height = self.rect.height()
         size = min(width, height) * 0.65
         x_center = width / 2
         y_center = height * 0.65
         radius = size * 0.4
+        return width, height, x_center, y_center, radius
+
+    def _dial_rect(self):
+        width, height, x_center, y_center, radius = self._geometry()
+        # Full width since the value box can be wider than the dial
+        top = int(y_center - radius) - 4
+        bottom = int(max(y_center + radius, y_center + radius * 0.45 + self._value_box_height)) + 4
+        return QRect(0, top, width, bottom - top)
+
+    def _needle_tip(self, x_center, y_center, radius):
+        value_ratio = (self.value - self.min_val) / (self.max_val - self.min_val)
+        idx = int(value_ratio * NEEDLE_STEPS + 0.5)
+        needle_x = x_center + (radius * 0.85) * NEEDLE_COS[idx]
+        needle_y = y_center + (radius * 0.85) * NEEDLE_SIN[idx]
+        return needle_x, needle_y
+
+    def _needle_rect(self):
+        width, height, x_center, y_center, radius = self._geometry()
+        needle_x, needle_y = self._needle_tip(x_center, y_center, radius)
+        # Cover the needle base and pen width
+        margin = radius * 0.08 + 3
+        left = int(min(x_center, needle_x) - margin)
+        top = int(min(y_center, needle_y) - margin)
+        right = int(max(x_center, needle_x) + margin) + 1
+        bottom = int(max(y_center, needle_y) + margin) + 1
+        return QRect(left, top, right - left, bottom - top)
+
+    def _value_rect(self):
+        width, height, x_center, y_center, radius = self._geometry()
+        # Full width since the value text length changes
+        top = int(y_center + radius * 0.45) - 1
+        return QRect(0, top, width, int(self._value_box_height) + 3)
+
+    def _rebuild_bg(self, dpr):
+        # Title is drawn live so gauges with the same range share one face
+        key = (self.rect.width(), self.rect.height(), dpr,
+               tuple(self._tick_labels.items()), self.panel.font().key())
+        pixmap = self._bg_cache.get(key)
+        if pixmap is None:
+            pixmap = self._draw_bg(dpr)
+            self._bg_cache[key] = pixmap
+        self._bg_pixmap = pixmap
+        self._bg_dpr = dpr
+
+    def _draw_bg(self, dpr):
+        width, height, x_center, y_center, radius = self._geometry()
+
+        # Render at device resolution so the face stays sharp on scaled screens
+        pixmap = QPixmap(self.rect.size() * dpr)
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(self.panel.font())
         
         # Draw gauge background
         painter.setPen(Qt.NoPen)
@@ -66,45 +228,58 @@ class CompactAnalogGauge(QWidget):
         )
         
         # Draw ticks
+        if self._tick_label_sizes is None:
+            metrics = QFontMetrics(painter.font())
+            self._tick_label_sizes = {
+                i: (metrics.horizontalAdvance(text), metrics.height())
+                for i, text in self._tick_labels.items()
+            }
+
+        # All tick marks are stroked as a single path
+        tick_path = QPainterPath()
+        for cos_a, sin_a in TICK_TRIG:
+            tick_path.moveTo(int(x_center + (radius * 0.7) * cos_a), int(y_center + (radius * 0.7) * sin_a))
+            tick_path.lineTo(int(x_center + (radius * 0.9) * cos_a), int(y_center + (radius * 0.9) * sin_a))
+
         pen = QPen(Qt.white, 1.5)
         painter.setPen(pen)
-        for i in range(0, 7):
-            angle = 180 + i * 30
-            rad_angle = math.radians(angle)
-            
-            # Calculate tick positions
-            inner_x = x_center + (radius * 0.7) * math.cos(rad_angle)
-            inner_y = y_center + (radius * 0.7) * math.sin(rad_angle)
-            outer_x = x_center + (radius * 0.9) * math.cos(rad_angle)
-            outer_y = y_center + (radius * 0.9) * math.sin(rad_angle)
+        painter.drawPath(tick_path)
+
+        # Draw numbers
+        for i, text in self._tick_labels.items():
+            cos_a, sin_a = TICK_TRIG[i]
+            text_width, text_height = self._tick_label_sizes[i]
             
-            painter.drawLine(int(inner_x), int(inner_y), int(outer_x), int(outer_y))
+            num_x = x_center + (radius * 0.75) * cos_a - text_width / 2
+            num_y = y_center + (radius * 0.75) * sin_a + text_height / 3
             
-            # Draw numbers
-            if i % 2 == 0:
-                value = self.min_val + (i / 6) * (self.max_val - self.min_val)
-                # Format values appropriately
-                if self.max_val >= 10000:
-                    if self.max_val > 30000:
-                        text = f"{value/1000:.0f}k" 
-                    else:
-                        text = f"{value/1000:.1f}k"
-                elif self.max_val >= 1000:
-                    text = f"{value/1000:.1f}k"
-                else:
-                    text = f"{value:.0f}"
-                    
-                text_width = QFontMetrics(painter.font()).width(text)
-                text_height = QFontMetrics(painter.font()).height()
-                
-                num_x = x_center + (radius * 0.75) * math.cos(rad_angle) - text_width / 2
-                num_y = y_center + (radius * 0.75) * math.sin(rad_angle) + text_height / 3
-                
-                painter.drawText(int(num_x), int(num_y), text)
+            painter.drawText(int(num_x), int(num_y), text)
         
-        # Draw needle
-        value_ratio = (self.value - self.min_val) / (self.max_val - self.min_val)
-        needle_angle = 180 + value_ratio * 180
+        painter.end()
+        return pixmap
+
+    def paint(self, painter, exposed):
+        """Draw into painter already translated to the gauge origin,
+        exposed is the damaged area in gauge coordinates"""
+        dpr = self.panel.devicePixelRatioF()
+        if self._bg_pixmap is None or self._bg_dpr != dpr:
+            self._rebuild_bg(dpr)
+
+        painter.setClipRect(exposed)
+        painter.drawPixmap(0, 0, self._bg_pixmap)
+
+        width, height, x_center, y_center, radius = self._geometry()
+
+        # Draw title
+        painter.setPen(Qt.white)
+        painter.setFont(self._title_font)
+        painter.drawText(int(x_center - self._title_width/2), int(height * 0.15), self.title)
+
+        # Nothing dynamic outside the dial strip
+        if not exposed.intersects(self._dial_rect()):
+            return
+
+        painter.setRenderHint(QPainter.Antialiasing)
         
         # Draw needle base
         painter.setPen(Qt.NoPen)
@@ -112,39 +287,28 @@ class CompactAnalogGauge(QWidget):
         painter.drawEllipse(QPointF(x_center, y_center), radius * 0.08, radius * 0.08)
         
         # Draw needle
-        rad_angle = math.radians(needle_angle)
-        needle_x = x_center + (radius * 0.85) * math.cos(rad_angle)
-        needle_y = y_center + (radius * 0.85) * math.sin(rad_angle)
+        needle_x, needle_y = self._needle_tip(x_center, y_center, radius)
         
         pen = QPen(QColor(220, 30, 30), 2)
         painter.setPen(pen)
         painter.drawLine(int(x_center), int(y_center), int(needle_x), int(needle_y))
-        
-        # Draw title
-        painter.setPen(Qt.white)
-        font = QFont("Arial", 9, QFont.Bold)
-        painter.setFont(font)
-        title_width = QFontMetrics(font).width(self.title)
-        painter.drawText(int(x_center - title_width/2), int(height * 0.15), self.title)
+        # Forget the old needle only once it has been painted over
+        needle_rect = self._needle_rect()
+        if self._last_needle_rect is None or exposed.contains(self._last_needle_rect):
+            self._last_needle_rect = needle_rect
+        else:
+            self._last_needle_rect = self._last_needle_rect.united(needle_rect)
         
         # Draw digital value
-        if self.max_val >= 10000:
-            if self.max_val > 30000:
-                value_text = f"{self.value:.0f} {self.units}"
-            else:
-                value_text = f"{self.value:.1f} {self.units}"
-        else:
-            value_text = f"{self.value:.1f} {self.units}"
-            
-        font = QFont("Arial", 10, QFont.Bold)
-        painter.setFont(font)
-        value_width = QFontMetrics(font).width(value_text)
+        value_text = self._value_fmt.format(self.value, self.units)
+        painter.setFont(self._value_font)
+        value_width = self._value_fm.horizontalAdvance(value_text)
         
         # Draw value background
         painter.setPen(Qt.NoPen)
         painter.setBrush(QColor(40, 40, 60))
         rect_width = value_width * 1.2
-        rect_height = QFontMetrics(font).height() * 1.3
+        rect_height = self._value_box_height
         painter.drawRect(
             int(x_center - rect_width/2), 
             int(y_center + radius * 0.45),
@@ -160,6 +324,60 @@ class CompactAnalogGauge(QWidget):
             value_text
         )
 
+class GaugePanel(QWidget):
+    """Row of gauges painted together onto a single widget"""
+    def __init__(self, gauge_config, parent=None):
+        super().__init__(parent)
+        self.spacing = 5
+        self.gauges = {}
+        for config in gauge_config:
+            self.gauges[config["key"]] = CompactAnalogGauge(
+                config["title"], 
+                config["min"], 
+                config["max"], 
+                config["units"],
+                self
+            )
+        count = len(self.gauges)
+        self.setMinimumSize(150 * count + self.spacing * (count - 1), 150)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    def set_values(self, values, update=True):
+        for key, value in values.items():
+            self.gauges[key].set_value(value, update)
+
+    def update_dials(self, keys):
+        for key in keys:
+            self.gauges[key].update_dial()
+
+    def resizeEvent(self, event):
+        # Same width for every gauge so identical faces can be shared,
+        # leftover pixels are split as a margin on both sides
+        count = len(self.gauges)
+        gauge_width = (self.width() - self.spacing * (count - 1)) // count
+        margin = (self.width() - gauge_width * count - self.spacing * (count - 1)) // 2
+        for i, gauge in enumerate(self.gauges.values()):
+            left = margin + i * (gauge_width + self.spacing)
+            gauge.set_geometry(QRect(left, 0, gauge_width, self.height()))
+        super().resizeEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.FontChange:
+            for gauge in self.gauges.values():
+                gauge.font_changed()
+        super().changeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        exposed = event.rect()
+        for gauge in self.gauges.values():
+            if not gauge.rect.intersects(exposed):
+                continue
+            painter.save()
+            painter.translate(gauge.rect.topLeft())
+            gauge.paint(painter, exposed.intersected(gauge.rect).translated(-gauge.rect.topLeft()))
+            painter.restore()
+
 class CompactSerialMonitor(QMainWindow):
     def __init__(self, serial_port=None):
         super().__init__()
@@ -169,6 +387,7 @@ class CompactSerialMonitor(QMainWindow):
         # Serial connection variables
         self.ser = None
         self.serial_port = serial_port
+        self._rxbuf = bytearray()
         self.log_file = None
         self.log_file_path = ""
         
@@ -189,23 +408,9 @@ class CompactSerialMonitor(QMainWindow):
         self.layout.setSpacing(8)
         self.layout.setContentsMargins(10, 10, 10, 10)
         
-        # Create single row for all five gauges
-        gauges_layout = QHBoxLayout()
-        gauges_layout.setSpacing(5)
-        
-        # Create gauges from configuration
-        self.gauges = {}
-        for config in self.gauge_config:
-            gauge = CompactAnalogGauge(
-                config["title"], 
-                config["min"], 
-                config["max"], 
-                config["units"]
-            )
-            self.gauges[config["key"]] = gauge
-            gauges_layout.addWidget(gauge)
-        
-        self.layout.addLayout(gauges_layout)
+        # Create single panel painting all gauges from configuration
+        self.gauge_panel = GaugePanel(self.gauge_config)
+        self.layout.addWidget(self.gauge_panel)
         
         # Create status bar
         status_layout = QHBoxLayout()
@@ -341,7 +546,7 @@ class CompactSerialMonitor(QMainWindow):
                 border-radius: 3px;
             }
         """)
-        self.power_slider.valueChanged.connect(self.send_power_value)
+        self.power_slider.valueChanged.connect(self.on_power_changed)
         power_layout.addWidget(self.power_slider, 0, 1, 1, 3)
         
         # Delta control
@@ -430,13 +635,20 @@ class CompactSerialMonitor(QMainWindow):
         self.layout.addLayout(command_layout)
         
         # Setup timers
+        # Serial reads are driven by a socket notifier where possible,
+        # this timer is only started as a polling fallback
         self.serial_timer = QTimer()
         self.serial_timer.timeout.connect(self.check_serial)
-        self.serial_timer.start(1)
+        self.serial_notifier = None
         
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self.update_time_display)
         self.update_timer.start(1000)
+
+        # Log file is buffered, push it to disk periodically
+        self.log_flush_timer = QTimer()
+        self.log_flush_timer.timeout.connect(self.flush_log_file)
+        self.log_flush_timer.start(500)
         
         # Initialize variables
         self.last_update_time = time.time()
@@ -446,29 +658,45 @@ class CompactSerialMonitor(QMainWindow):
         self.rpm_value = 0
         self.power_value = 0
         self.eff_value = 0
-        self.log_entries = []
         self.is_logging = False
-        
-        # Connect slider value change to update display
-        self.power_slider.valueChanged.connect(self.update_power_display)
+        self._dirty_gauges = set()
+        self._gauge_flush_pending = False
+        self._time_stale = None
+        self._log_ts_second = None
+        self._log_ts_prefix = ""
+        self._power_send_pending = False
         
         # Request serial port
         self.get_serial_port()
 
+    def on_power_changed(self, value):
+        self.update_power_display(value)
+        self.schedule_power_send()
+
     def update_power_display(self, value):
         self.current_power_label.setText(f"Current: {value}")
 
+    def schedule_power_send(self):
+        # Debounce slider drags, only the latest value is sent
+        if not self._power_send_pending:
+            self._power_send_pending = True
+            QTimer.singleShot(50, self.flush_power_value)
+
+    def flush_power_value(self):
+        self._power_send_pending = False
+        self.send_power_value()
+
     def increase_power(self):
         delta = self.delta_spin.value()
         new_value = min(1000, self.power_slider.value() + delta)
         self.power_slider.setValue(new_value)
-        self.send_power_value()
+        self.schedule_power_send()
 
     def decrease_power(self):
         delta = self.delta_spin.value()
         new_value = max(0, self.power_slider.value() - delta)
         self.power_slider.setValue(new_value)
-        self.send_power_value()
+        self.schedule_power_send()
 
     def send_power_value(self):
         value = 1000 + self.power_slider.value()
@@ -482,9 +710,7 @@ class CompactSerialMonitor(QMainWindow):
                 
                 # Write to log file if logging is enabled
                 if self.is_logging and self.log_file:
-                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-                    self.log_file.write(f"[{timestamp}] TX: {log_entry}\n")
-                    self.log_file.flush()
+                    self.log_file.write(f"[{self.log_timestamp()}] TX: {log_entry}\n")
             except Exception as e:
                 self.add_log(f"Power send error: {str(e)}")
         else:
@@ -509,6 +735,7 @@ class CompactSerialMonitor(QMainWindow):
             self.status_label.setText(f"Connected to {self.serial_port} @ 115200")
             self.status_label.setStyleSheet("color: #00FF80; font-weight: bold;")
             self.add_log(f"Connected to {self.serial_port} @ 115200 baud")
+            self.start_serial_watch()
         except Exception as e:
             self.status_label.setText(f"Error: {str(e)}")
             self.status_label.setStyleSheet("color: #FF5050; font-weight: bold;")
@@ -516,6 +743,31 @@ class CompactSerialMonitor(QMainWindow):
             self.add_log("Please check connection and restart with --port option")
             self.ser = None
 
+    def start_serial_watch(self):
+        # Wake up only when the OS reports pending bytes (POSIX), otherwise poll
+        if not sys.platform.startswith('win') and hasattr(self.ser, 'fileno'):
+            self.serial_notifier = QSocketNotifier(self.ser.fileno(), QSocketNotifier.Read, self)
+            self.serial_notifier.activated.connect(self.check_serial)
+        else:
+            # USB-CDC buffers on the host side, 10 ms polling is plenty
+            self.serial_timer.start(10)
+
+    def disconnect_serial(self):
+        if self.serial_notifier:
+            self.serial_notifier.setEnabled(False)
+            self.serial_notifier.deleteLater()
+            self.serial_notifier = None
+        self.serial_timer.stop()
+        try:
+            self.ser.close()
+        except Exception:
+            pass
+        self.ser = None
+        self._rxbuf.clear()
+        self.status_label.setText("Disconnected")
+        self.status_label.setStyleSheet("color: #FF5050; font-weight: bold;")
+        self.add_log("Serial port lost, restart to reconnect")
+
     def toggle_logging(self):
         if not self.is_logging:
             # Start logging
@@ -535,7 +787,7 @@ class CompactSerialMonitor(QMainWindow):
         self.log_file_path = os.path.join(logs_dir, f"instrument_log_{timestamp}.txt")
         
         try:
-            self.log_file = open(self.log_file_path, 'a')
+            self.log_file = open(self.log_file_path, 'a', buffering=64 * 1024)
             self.is_logging = True
             self.log_button.setText("Stop Logging")
             self.log_button.setStyleSheet("""
@@ -565,6 +817,7 @@ class CompactSerialMonitor(QMainWindow):
     def stop_logging(self):
         if self.log_file:
             try:
+                self.log_file.flush()
                 self.log_file.close()
                 self.is_logging = False
                 self.log_button.setText("Start Logging")
@@ -587,6 +840,22 @@ class CompactSerialMonitor(QMainWindow):
             except Exception as e:
                 self.add_log(f"Error closing log file: {str(e)}")
 
+    def flush_log_file(self):
+        if self.log_file and not self.log_file.closed:
+            try:
+                self.log_file.flush()
+            except Exception as e:
+                self.add_log(f"Log flush error: {str(e)}")
+
+    def log_timestamp(self):
+        # Date/time part only changes once per second, reuse it until then
+        now = time.time()
+        second = int(now)
+        if second != self._log_ts_second:
+            self._log_ts_second = second
+            self._log_ts_prefix = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+        return "%s.%03d" % (self._log_ts_prefix, int((now - second) * 1000))
+
     def open_log_file(self):
         if self.log_file_path and os.path.exists(self.log_file_path):
             try:
@@ -601,108 +870,107 @@ class CompactSerialMonitor(QMainWindow):
         else:
             self.add_log("Log file doesn't exist")
 
-    def check_serial(self):
-        if self.ser and self.ser.in_waiting:
-            try:
-                # Read raw bytes
-                raw_data = self.ser.readline()
-                
-                # Try to decode as ASCII
-                try:
-                    line = raw_data.decode('ascii').strip()
-                except UnicodeDecodeError:
-                    # If ASCII fails, try UTF-8 with replacement
-                    try:
-                        line = raw_data.decode('utf-8', errors='replace').strip()
-                    except:
-                        # If all else fails, use raw hex representation
-                        line = "RAW: " + raw_data.hex()
+    def check_serial(self, *args):
+        if not self.ser:
+            return
+        try:
+            # Drain every pending byte in one read, keep partial line for next call
+            pending = self.ser.in_waiting
+            if not pending:
+                if not args:
+                    return
+                # Notifier reports readable with nothing queued, a read
+                # either picks up the byte or raises on a hung-up port
+                pending = 1
+            self._rxbuf += self.ser.read(pending)
+        except (OSError, serial.SerialException) as e:
+            # Port is gone, stop the level-triggered notifier from spinning
+            self.add_log(f"Read error: {str(e)}")
+            self.disconnect_serial()
+            return
+
+        try:
+            end = self._rxbuf.rfind(b'\n')
+            if end < 0:
+                return
+            lines = self._rxbuf[:end].split(b'\n')
+            del self._rxbuf[:end + 1]
+
+            for raw_data in lines:
+                # Latin-1 maps every byte to a character and never raises
+                line = raw_data.decode('latin-1').strip()
                 
                 if line:
-                    self.add_log(line)
+                    # Show line noise as raw hex representation, parse the text regardless
+                    shown = "RAW: " + raw_data.hex() if _LINE_NOISE.search(line) else line
+                    self.add_log(shown)
                     
-                    # Only process CSV data
-                    if self.is_csv_data(line):
-                        self.process_serial_data(line)
+                    # Non-CSV lines are ignored by the parser
+                    self.process_serial_data(line)
                     
                     # Write to log file if logging is enabled
                     if self.is_logging and self.log_file:
-                        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-                        self.log_file.write(f"[{timestamp}] RX: {line}\n")
-                        self.log_file.flush()
-            except Exception as e:
-                self.add_log(f"Read error: {str(e)}")
-
-    def is_csv_data(self, data):
-        """Check if data appears to be CSV format"""
-        # Require at least 4 commas for 5 values
-        return data.count(',') >= 4
+                        self.log_file.write(f"[{self.log_timestamp()}] RX: {shown}\n")
+        except Exception as e:
+            self.add_log(f"Read error: {str(e)}")
 
     def process_serial_data(self, data):
-        try:
-            # Extract numbers, commas, and decimal points
-            cleaned_data = ''.join(c for c in data if c in '0123456789,.- ')
-            parts = cleaned_data.split(',')
-            
-            if len(parts) >= 5:
-                # Parse all values
-                time_ms = int(parts[0].strip())
-                thrust = float(parts[1].strip())
-                current = float(parts[2].split()[0].strip())
-                voltage = float(parts[3].split()[0].strip())
-                rpm = float(parts[4].split()[0].strip())
-                
-                # Calculate power
-                power = 0
-                if (current >= 0.001):
-                    power = voltage * current
-
-                # Calculate eff
-                eff = 0
-                if (power >= 0.001):
-                    eff = thrust/power;
-                
-                # Update values
-                self.thrust_value = thrust
-                self.current_value = current
-                self.voltage_value = voltage
-                self.rpm_value = rpm
-                self.power_value = power
-                self.eff_value = eff
-                self.last_update_time = time.time()
-                
-                # Update gauges from configuration
-                self.gauges["thrust"].set_value(thrust)
-                self.gauges["current"].set_value(current)
-                self.gauges["voltage"].set_value(voltage)
-                self.gauges["rpm"].set_value(rpm)
-                self.gauges["power"].set_value(power)
-                self.gauges["eff"].set_value(eff)
-                
-                # Update time display
-                self.time_label.setText(f"{time_ms/1000.0} s")
-        except ValueError as e:
-            # Don't log non-CSV errors since we're already ignoring them
-            pass
+        """Parse a CSV telemetry line, returns False if it is not one"""
+        sample = parse_telemetry(data)
+        if sample is None:
+            return False
+        time_ms, thrust, current, voltage, rpm, power, eff = sample
+        
+        # Update values
+        self.thrust_value = thrust
+        self.current_value = current
+        self.voltage_value = voltage
+        self.rpm_value = rpm
+        self.power_value = power
+        self.eff_value = eff
+        self.last_update_time = time.time()
+        
+        # Update gauges from configuration, repaint once per event loop pass
+        self.set_gauge_values({
+            "thrust": thrust,
+            "current": current,
+            "voltage": voltage,
+            "rpm": rpm,
+            "power": power,
+            "eff": eff,
+        })
+        
+        # Update time display
+        self.time_label.setText(f"{time_ms/1000.0} s")
+        return True
+
+    def set_gauge_values(self, values):
+        self.gauge_panel.set_values(values, update=False)
+        self._dirty_gauges.update(values)
+        if not self._gauge_flush_pending:
+            self._gauge_flush_pending = True
+            QTimer.singleShot(0, self.flush_gauges)
+
+    def flush_gauges(self):
+        self._gauge_flush_pending = False
+        self.gauge_panel.update_dials(self._dirty_gauges)
+        self._dirty_gauges.clear()
 
     def update_time_display(self):
         # This timer updates the "time since last update" display
         if self.last_update_time:
             seconds_ago = int(time.time() - self.last_update_time)
-            if seconds_ago > 5:
-                self.time_label.setStyleSheet("color: #FF5050; font-weight: bold;")
-            else:
-                self.time_label.setStyleSheet("color: #00C8FF; font-weight: bold;")
+            stale = seconds_ago > 5
+            # Restyling re-parses the stylesheet, only do it on transitions
+            if stale != self._time_stale:
+                self._time_stale = stale
+                self.time_label.setStyleSheet(TIME_STALE_STYLE if stale else TIME_FRESH_STYLE)
 
     def add_log(self, entry):
-        self.log_entries.append(entry)
-        # Keep only last 10 entries
-        if len(self.log_entries) > 10:
-            self.log_entries.pop(0)
-        
-        # Update list widget
-        self.log_list.clear()
-        self.log_list.addItems(self.log_entries)
+        # Append the new entry and keep only last 10 entries
+        self.log_list.addItem(entry)
+        if self.log_list.count() > 10:
+            self.log_list.takeItem(0)
         self.log_list.scrollToBottom()
 
     def send_command(self):
@@ -715,9 +983,7 @@ class CompactSerialMonitor(QMainWindow):
                 
                 # Write to log file if logging is enabled
                 if self.is_logging and self.log_file:
-                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-                    self.log_file.write(f"[{timestamp}] TX: {log_entry}\n")
-                    self.log_file.flush()
+                    self.log_file.write(f"[{self.log_timestamp()}] TX: {log_entry}\n")
                 
                 self.command_input.clear()
             except Exception as e:
@@ -727,11 +993,14 @@ class CompactSerialMonitor(QMainWindow):
 
     def closeEvent(self, event):
         # Close serial connection
+        if self.serial_notifier:
+            self.serial_notifier.setEnabled(False)
         if self.ser and self.ser.is_open:
             self.ser.close()
         
         # Close log file
         if self.log_file and not self.log_file.closed:
+            self.log_file.flush()
             self.log_file.close()
         
         event.accept()
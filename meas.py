@@ -2,52 +2,185 @@ import serial
 import time
 import argparse
 import sys
+import os
+import gc
+import selectors
+import ctypes
+import ctypes.util
+
+# Sleeps shorter than this are finished by spinning on the clock
+SPIN_MARGIN = 2e-3
+
+# mlockall flags from <sys/mman.h>
+MCL_CURRENT = 1
+MCL_FUTURE = 2
+
+def precise_sleep(dt):
+    """Sleep for dt seconds, spinning the last SPIN_MARGIN to avoid over-sleep"""
+    end = time.monotonic() + dt
+    coarse = dt - SPIN_MARGIN
+    if coarse > 0:
+        time.sleep(coarse)
+    while time.monotonic() < end:
+        pass
+
+def raise_priority():
+    """Pin to one core and switch to SCHED_FIFO (or a lower nice value if not
+    permitted), returns the previous (policy, param, affinity) for restore_priority"""
+    policy = param = affinity = None
+    try:
+        affinity = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {min(affinity)})
+    except (AttributeError, OSError):
+        affinity = None
+    try:
+        policy, param = os.sched_getscheduler(0), os.sched_getparam(0)
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(10))
+    except PermissionError:
+        policy = param = None
+        try:
+            os.nice(-10)
+        except PermissionError:
+            pass
+    except (AttributeError, OSError):
+        policy = param = None
+    return policy, param, affinity
+
+def restore_priority(previous):
+    policy, param, affinity = previous
+    try:
+        if policy is not None:
+            os.sched_setscheduler(0, policy, param)
+        if affinity is not None:
+            os.sched_setaffinity(0, affinity)
+    except OSError:
+        pass
+
+def pwm_value(text):
+    """argparse type for PWM pulse widths"""
+    value = int(text)
+    if not 1000 <= value <= 2000:
+        raise argparse.ArgumentTypeError("PWM values must be between 1000 and 2000")
+    return value
+
+def positive_int(text):
+    """argparse type for sweep steps"""
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError("must be a positive integer")
+    return value
+
+def lock_memory():
+    """Lock current and future pages in RAM so wake-ups don't page-fault,
+    needs CAP_IPC_LOCK or a large enough memlock limit, returns an error
+    message or None on success"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if libc.mlockall(MCL_CURRENT | MCL_FUTURE) != 0:
+            return os.strerror(ctypes.get_errno())
+    except (OSError, AttributeError) as e:
+        return str(e)
+    return None
+
+def unlock_memory():
+    try:
+        ctypes.CDLL(ctypes.util.find_library('c')).munlockall()
+    except (OSError, AttributeError):
+        pass
 
 def main():
     parser = argparse.ArgumentParser(description='Propeller PWM Sweep Program')
     parser.add_argument('--port', default='/dev/ttyUSB0', help='Serial port (default: /dev/ttyUSB1)')
     parser.add_argument('--baud', type=int, default=115200, help='Baud rate (default: 115200)')
-    parser.add_argument('--start', type=int, default=1000, help='Start PWM value (default: 1000)')
-    parser.add_argument('--end', type=int, default=2000, help='End PWM value (default: 2000)')
-    parser.add_argument('--increment', type=int, default=100, help='PWM increment step (default: 100)')
+    parser.add_argument('--start', type=pwm_value, default=1000, help='Start PWM value (default: 1000)')
+    parser.add_argument('--end', type=pwm_value, default=2000, help='End PWM value (default: 2000)')
+    parser.add_argument('--increment', type=positive_int, default=100, help='PWM increment step (default: 100)')
     parser.add_argument('--wait', type=float, default=2.0, help='Stabilization time in seconds (default: 2.0)')
     parser.add_argument('--output', help='Output file (default: stdout)')
     args = parser.parse_args()
 
-    # Validate PWM range
-    if not (1000 <= args.start <= 2000 and 1000 <= args.end <= 2000):
-        print("Error: PWM values must be between 1000 and 2000", file=sys.stderr)
-        sys.exit(1)
+    # Keep the sleep/read schedule tight while the sweep runs
+    lock_error = lock_memory()
+    if lock_error:
+        print(f"Warning: could not lock memory: {lock_error}", file=sys.stderr)
+    previous_priority = raise_priority()
 
     try:
         # Setup serial connection
         with serial.Serial(args.port, args.baud, timeout=1) as ser:
             ser.write('T\n'.encode())
-            ser.flush()
             time.sleep(2)
-            # Open output file or use stdout
-            f = open(args.output, 'w') if args.output else sys.stdout
+            # Open output file or use stdout, rows are written as raw bytes
+            f = open(args.output, 'wb') if args.output else sys.stdout.buffer
 
             # PWM sweep loop
             pwm_values = range(args.start, args.end + 1, args.increment)
-            for pwm in pwm_values:
-                # Send PWM command
-                ser.write(f'P {pwm}\n'.encode())
-                ser.flush()
+            # Commands are rendered up front to keep formatting out of the timed loop
+            commands = tuple(b'P %d\n' % pwm for pwm in pwm_values)
+            # Wait on the port descriptor directly and read whole chunks
+            fd = ser.fileno()
+            sel = selectors.DefaultSelector()
+            sel.register(fd, selectors.EVENT_READ)
+            buf = bytearray()
+            out = bytearray()
+            # Bind hot-loop callables to locals
+            write = ser.write
+            select = sel.select
+            read = os.read
+            monotonic = time.monotonic
+            # No collector pauses inside the timed loop
+            gc.disable()
+            try:
+                # Step deadlines are absolute so over-sleep cannot accumulate
+                t0 = monotonic()
+                for i, cmd in enumerate(commands):
+                    # Send PWM command
+                    write(cmd)
 
-                # Wait for stabilization
-                time.sleep(args.wait)
+                    # Keep consuming telemetry while waiting for stabilization,
+                    # the last complete frame before the deadline wins
+                    line = None
+                    deadline = t0 + (i + 1) * args.wait
+                    while True:
+                        remaining = deadline - monotonic()
+                        if remaining <= SPIN_MARGIN:
+                            # Too close to the deadline for a blocking read
+                            precise_sleep(remaining)
+                            break
+                        # Wake up on data, or in time to spin out the deadline
+                        if not select(remaining - SPIN_MARGIN):
+                            continue
+                        chunk = read(fd, 4096)
+                        if not chunk:
+                            # Readable with no data means the port hung up
+                            raise serial.SerialException("device disconnected")
+                        buf += chunk
+                        end = buf.rfind(b'\n')
+                        if end < 0:
+                            continue
+                    
+                        # Validate data on raw bytes, partial line stays buffered
+                        for raw in reversed(buf[:end].split(b'\n')):
+                            frame = raw.strip()
+                            if frame and frame.count(b',') == 4:
+                                line = frame
+                                break
+                        del buf[:end + 1]
                 
-                # Read and process data
-                ser.reset_input_buffer()
-                line = ser.readline().decode().strip()
-                
-                # Validate and output data
-                if line and line.count(',') == 4:
-                    f.write(line + '\n')
-
-                f.flush()
+                    # Collect data, written out once the sweep is done
+                    if line:
+                        out += line
+                        out += b'\n'
+            finally:
+                gc.enable()
+                gc.collect()
+                sel.close()
+                # Output data, also on an interrupted sweep
+                if out:
+                    f.write(out)
+                    f.flush()
 
+            # Make sure the motor stop command is drained before closing
             ser.write('P 0\n'.encode())
             ser.flush()
             # Close file if not stdout
@@ -57,9 +190,14 @@ def main():
     except serial.SerialException as e:
         print(f"Serial port error: {e}", file=sys.stderr)
         sys.exit(1)
-    except Exception as e:
+    except OSError as e:
+        # Output file and descriptor errors, programming errors propagate
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        restore_priority(previous_priority)
+        if not lock_error:
+            unlock_memory()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file